@@ -15,7 +15,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 from sqlalchemy import desc
 from sqlalchemy.exc import SQLAlchemyError
-from PyQt6.QtWidgets import QTableWidget
+from PyQt6.QtWidgets import QTableWidget, QTableView
 from src.models.base import Session
 from src.models.fmp.stock import DailyChartEOD
 from src.dal.fmp.database_query import StockQuery
@@ -532,19 +532,19 @@ class StockReporting:
             raise RuntimeError(
                 f"Failed to report on table performance due to an unexpected error: {e}") from e
 
-    def get_sql_query_result(self, table_widget: QTableWidget, query_text: str) -> None:
+    def get_sql_query_result(self, table_view: QTableView, query_text: str) -> None:
         """
         Executes a given SQL query using a database interface, converts the 
-        results to a DataFrame, and populates a specified QTableWidget with the 
-        DataFrame.
+        results to a DataFrame, and displays the DataFrame in a specified 
+        QTableView.
 
         This function takes an SQL query as a string, executes it to fetch 
-        data, and then uses this data to populate a QTableWidget using a helper 
+        data, and then displays this data in a QTableView using a helper 
         function. It handles both database-specific errors and other unexpected 
         errors by re-raising them as RuntimeError with appropriate messages.
 
         Args:
-            table_widget (QTableWidget): The QTableWidget instance where the 
+            table_view (QTableView): The QTableView instance where the 
             results will be displayed.
             query_text (str): The SQL query string to be executed.
 
@@ -556,7 +556,7 @@ class StockReporting:
         try:
             df_result = self.stock_query.fetch_sql_query_as_dataframe(query_text)
 
-            plot.populate_tablewidget_with_df(table_widget, df_result)
+            plot.populate_tableview_with_df(table_view, df_result)
 
         except SQLAlchemyError as e:
             raise RuntimeError(
@@ -10,6 +10,7 @@ Created on 2024-03-11
 """
 
 import datetime
+import numpy as np
 import holidays
 from sqlalchemy import Table, Column, Date, MetaData
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
@@ -45,8 +46,25 @@ def parse_date(date_str):
     Note:
         Currently supported date formats are "%Y-%m-%d" (e.g. "2023-03-11"), 
         "%d/%m/%Y" (e.g. "11/03/2023") and "%Y%m%d" (e.g. "20230311").
+        Zero-padded strings are sliced directly, which avoids the cost of
+        `strptime`; other spellings fall back to `strptime`.
 
     """
+    # Fast path: fixed-width, zero-padded dates are sliced directly
+    if date_str.replace('-', '').replace('/', '').isdigit():
+        try:
+            if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+                return datetime.date(
+                    int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+            if len(date_str) == 10 and date_str[2] == '/' and date_str[5] == '/':
+                return datetime.date(
+                    int(date_str[6:]), int(date_str[3:5]), int(date_str[:2]))
+            if len(date_str) == 8 and date_str.isdigit():
+                return datetime.date(
+                    int(date_str[:4]), int(date_str[4:6]), int(date_str[6:]))
+        except ValueError:
+            pass
+
     for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%Y%m%d"):
         try:
             return datetime.datetime.strptime(date_str, fmt).date()
@@ -84,15 +102,15 @@ def generate_business_time_series():
         end_date = datetime.date(2030, 12, 31)
 
         # Get holidays in the range
-        fr_holidays = holidays.financial_holidays('FR')
+        fr_holidays = holidays.financial_holidays(
+            'FR', years=range(start_date.year, end_date.year + 1))
+        holiday_dates = np.array(list(fr_holidays), dtype='datetime64[D]')
 
         # Generate business dates, excluding weekends and holidays
-        business_dates = [
-            current_date
-            for current_date in (start_date + datetime.timedelta(n) for n in range(
-                (end_date - start_date).days + 1))
-            if current_date.weekday() < 5 and current_date not in fr_holidays
-        ]
+        all_dates = np.arange(np.datetime64(start_date), np.datetime64(end_date) + 1,
+                              dtype='datetime64[D]')
+        business_dates = all_dates[
+            np.is_busday(all_dates, holidays=holiday_dates)].tolist()
 
         # Define metadata object
         metadata = MetaData()
@@ -107,14 +125,14 @@ def generate_business_time_series():
         # Convert table into TimescaleDB hypertable
         convert_table_to_hypertable(table)
 
-        # Insert business dates into the database
+        # Insert business dates into the database in a single executemany call
         with engine.connect() as connection:
             # Use transaction to rollback in case of any error
             with connection.begin():
-                for business_date in business_dates:
-                    connection.execute(
-                        business_dates_table.insert().values(date=business_date)
-                    )
+                connection.execute(
+                    business_dates_table.insert(),
+                    [{'date': business_date} for business_date in business_dates]
+                )
         # print("Business dates inserted successfully.")
 
     except IntegrityError as e:
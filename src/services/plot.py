@@ -9,19 +9,77 @@ Created on 2024-03-15
 
 """
 
+import atexit
+import functools
+import os
+import shutil
+import tempfile
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib import colormaps
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 import squarify
-from plotly.offline import plot
+from plotly.offline import plot, get_plotlyjs
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 import plotly.express as px
-from PyQt6.QtWidgets import (QTableWidget, QTableWidgetItem, QHeaderView,
-     QVBoxLayout)
+from PyQt6.QtWidgets import (QTableWidget, QTableWidgetItem, QTableView,
+     QHeaderView, QVBoxLayout)
+from PyQt6.QtCore import QUrl
 from PyQt6.QtWebEngineWidgets import QWebEngineView
+from src.services.various import DataFrameModel
 
+# HTML of the most recently displayed Plotly charts, from the least to the most
+# recently used
+PLOTLY_HTML_CACHE: dict[tuple, str] = {}
+PLOTLY_HTML_CACHE_SIZE = 16
+
+# Maximum number of candles sent to Plotly by the candlestick chart
+MAX_CANDLES = 2000
+
+
+def get_non_missing_values(df: pd.DataFrame, var: str) -> np.ndarray:
+    """
+    Returns the non-missing values of a DataFrame column as a NumPy array.
+
+    Float columns are filtered directly on their NumPy values, which avoids 
+    building the intermediate Series (and its index) created by `dropna`. 
+    Other dtypes, such as dates stored as objects or nullable integers, keep 
+    relying on `dropna` for their missing value semantics.
+
+    Args:
+        df (pd.DataFrame): The DataFrame containing the data.
+        var (str): The name of the column to extract.
+
+    Returns:
+        np.ndarray: The column values, without NaN or None.
+
+    """
+    values = df[var].to_numpy()
+    if values.dtype.kind == 'f':
+        return values[~np.isnan(values)]
+
+    return df[var].dropna().to_numpy()
+
+def check_columns_exist(df: pd.DataFrame, columns: list) -> None:
+    """
+    Ensures that all the given columns exist in a DataFrame.
+
+    The set of DataFrame columns is built once, so that every plot function 
+    shares the same check instead of repeating its own `in df.columns` scans.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to be checked.
+        columns (list of str): The names of the required columns.
+
+    Raises:
+        ValueError: If any of the columns is not found in the DataFrame.
+
+    """
+    available = set(df.columns)
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"DataFrame missing the required columns: {missing}")
 
 def plot_distributions_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     variables: list, title: str = "") -> None:
@@ -46,17 +104,20 @@ def plot_distributions_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     n_vars = len(variables)
 
     # Check if all specified variables exist in the DataFrame
-    for var in variables:
-        if var not in df.columns:
-            raise ValueError(f"Variable '{var}' not found in the DataFrame.")
+    check_columns_exist(df, variables)
 
     # Create a subplot for each variable
     axes = canvas.figure.subplots(1, n_vars, squeeze=False).flatten()
 
     # Display distributions for each variable
     for i, var in enumerate(variables):
-        data = df[var].dropna()
-        axes[i].hist(data, bins=30, alpha=0.7, label=var, color='skyblue', edgecolor='black')
+        data = get_non_missing_values(df, var)
+        # Bin with NumPy, once dates have been converted to Matplotlib floats
+        axes[i].xaxis.update_units(data)
+        values = np.asarray(axes[i].convert_xunits(data), dtype=float)
+        counts, edges = np.histogram(values, bins=30)
+        axes[i].bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                    alpha=0.7, label=var, color='skyblue', edgecolor='black')
         axes[i].set_ylabel("frequency")
         axes[i].set_xlabel(var)
 
@@ -67,8 +128,9 @@ def plot_distributions_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     # Adjust layout to make room for the figure title and ensure plots are not overlapping
     canvas.figure.tight_layout(rect=[0, 0.03, 1, 0.95])
 
-    # Refresh the canvas with the new plot
-    canvas.draw()
+    # Schedule a refresh of the canvas with the new plot (repeated requests
+    # are merged into a single draw by the Qt event loop)
+    canvas.draw_idle()
 
 def plot_horizontal_barchart_widget(canvas: FigureCanvasQTAgg,
     df: pd.DataFrame, x_var: str, y_var:str, title: str) -> None:
@@ -94,41 +156,47 @@ def plot_horizontal_barchart_widget(canvas: FigureCanvasQTAgg,
         - ValueError: If the specified columns (x_var or y_var) do not exist in the DataFrame.
     """
     # Ensure the specified columns exist in the DataFrame
-    if x_var not in df.columns or y_var not in df.columns:
-        raise ValueError(f"The DataFrame must contain the columns '{x_var}' and '{y_var}'.")
+    check_columns_exist(df, [x_var, y_var])
 
     # Clear the existing figure to prepare for a new plot
     canvas.figure.clf()
     ax = canvas.figure.add_subplot(111)  # Create an axes instance in the figure
 
-    # Sort DataFrame based on x_var in descending order
-    df_sorted = df.sort_values(by=x_var, ascending=False)
-
-    # Limit and group data
-    if len(df_sorted) > 25:
-        top_df = df_sorted.head(24)  # Get the top 19 entries
+    # Work on the column values rather than on DataFrame copies
+    # (float conversion handles nullable and unsigned integer columns)
+    values = df[x_var].to_numpy(dtype=float, na_value=np.nan)
+    labels = df[y_var].to_numpy()
+    # Missing values rank last, as with DataFrame.sort_values
+    rank = np.where(np.isnan(values), -np.inf, values)
+
+    # Limit and group data, in descending order of x_var
+    if len(values) > 25:
+        # Partial sort : only the top 24 entries need to be ordered
+        top = np.argpartition(rank, len(rank) - 24)[-24:]
+        top = top[np.argsort(-rank[top], kind='stable')]
+        top_values = values[top]
         # Sum other entries and add as 'Miscellaneous'
-        misc_sum = df_sorted[x_var][24:].sum()
-        misc_row = pd.DataFrame({y_var: ['Miscellaneous'], x_var: [misc_sum]})
-        df_final = pd.concat([top_df, misc_row], ignore_index=True)
+        others = np.ones(len(values), dtype=bool)
+        others[top] = False
+        misc_sum = np.nansum(values[others])
+        values = np.append(top_values, misc_sum)
+        labels = np.append(labels[top], 'Miscellaneous')
     else:
-        df_final = df_sorted
+        order = np.argsort(-rank, kind='stable')
+        values, labels = values[order], labels[order]
 
     # Create the horizontal bar chart directly on the provided axes
-    bars = ax.barh(df_final[y_var], df_final[x_var], color='skyblue')
+    bars = ax.barh(labels, values, color='skyblue')
 
-    # Annotate each bar with its value
-    for bar_ in bars:
-        width = bar_.get_width()
-        ax.text(width, bar_.get_y() + bar_.get_height() / 2, f'{width:.0f}',
-                va='center', ha='left')  # Align text to the left (inside the bar)
+    # Annotate each bar with its value, at the end of the bar
+    ax.bar_label(bars, fmt='%.0f')
 
     ax.set_xlabel(x_var)
     ax.set_ylabel(y_var)
     ax.set_title(title)
 
     canvas.figure.tight_layout()  # Adjust layout to prevent overlap
-    canvas.draw()  # Refresh the canvas with the new plot
+    canvas.draw_idle()  # Schedule a refresh of the canvas with the new plot
 
 def plot_treemap_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     title: str) -> None:
@@ -152,15 +220,16 @@ def plot_treemap_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
         raise ValueError("DataFrame must have exactly two columns.")
 
     # Assuming the first column contains labels and the second contains counts
-    labels = df.iloc[:, 0].tolist()
-    counts = df.iloc[:, 1].tolist()
+    # (counts stay a NumPy array, which squarify accepts as is)
+    counts = df.iloc[:, 1].to_numpy()
 
     # Concatenate labels and counts
-    labels_with_counts = [f"{label}: {count}" for label, count in zip(labels, counts)]
+    labels_with_counts = [f"{label}: {count}"
+                          for label, count in zip(df.iloc[:, 0].tolist(), counts.tolist())]
 
     # Choosing a color palette with Matplotlib
-    palette = plt.cm.viridis # pylint: disable=no-member
-    colors = [palette(i / len(labels)) for i in range(len(labels))]
+    palette = colormaps['viridis']
+    colors = palette(np.arange(len(counts)) / len(counts))
 
     # Clear the existing figure to prepare for a new plot
     canvas.figure.clf()
@@ -173,8 +242,9 @@ def plot_treemap_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     ax.set_title(title)
     ax.axis('off')  # Removes the axes for a cleaner look
 
-    # Refresh the canvas with the new plot
-    canvas.draw()
+    # Schedule a refresh of the canvas with the new plot (repeated requests
+    # are merged into a single draw by the Qt event loop)
+    canvas.draw_idle()
 
 def plot_grouped_barchart_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     title: str) -> None:
@@ -205,21 +275,18 @@ def plot_grouped_barchart_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     # Create an index for each tick position
     indices = np.arange(n_groups)
 
+    # Offset of each category ('True' or 'False') around the tick positions
+    offsets = (np.arange(n_categories) - n_categories / 2) * bar_width + bar_width / 2
+
+    # Extract all row values at once, one row per category
+    values = df.to_numpy()
+
     # Plot each category
     for i, category in enumerate(df.index):
-        # Offset index depending on the category ('True' or 'False')
-        offset = (i - n_categories / 2) * bar_width + bar_width / 2
-        values = df.loc[category]  # Extract row values for True or False
-        bars = ax.bar(indices + offset, values, width=bar_width, label=str(category))
-
-        # Annotate each bar with its value
-        for bar_ in bars:
-            height = bar_.get_height()
-            ax.annotate(f"{format(height)}",
-                        xy=(bar_.get_x() + bar_.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom')
+        bars = ax.bar(indices + offsets[i], values[i], width=bar_width, label=str(category))
+
+        # Annotate each bar with its value, 3 points above the bar
+        ax.bar_label(bars, labels=[format(value) for value in values[i].tolist()], padding=3)
 
     # Set chart titles and labels
     ax.set_xlabel('Categories')
@@ -231,7 +298,36 @@ def plot_grouped_barchart_widget(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
 
     # Adjust layout and refresh the canvas
     canvas.figure.tight_layout()
-    canvas.draw()
+    canvas.draw_idle()
+
+def format_series_as_strings(series: pd.Series) -> list[str]:
+    """
+    Converts the values of a Pandas Series into display strings, in a single 
+    pass per column. Float values holding an integer are displayed without 
+    their decimal part.
+
+    Args:
+        series (pd.Series): The column to format.
+
+    Returns:
+        list[str]: The formatted value of each row, in the Series order.
+
+    """
+    if series.dtype.kind == 'f':
+        values = series.to_numpy()
+        strings = values.astype(str).astype(object)
+
+        # Integer-valued floats are cast to int in one vectorized operation
+        is_integer = np.isfinite(values) & (values == np.floor(values))
+        fits_int64 = is_integer & (np.abs(values) < 2**63)
+        strings[fits_int64] = values[fits_int64].astype(np.int64).astype(str)
+        for i in np.flatnonzero(is_integer & ~fits_int64):
+            strings[i] = str(int(values[i]))
+
+        return strings.tolist()
+
+    return [str(int(value)) if isinstance(value, float) and value.is_integer()
+            else str(value) for value in series.tolist()]
 
 def populate_tablewidget_with_df(table_widget: QTableWidget,
     df: pd.DataFrame)  -> None:
@@ -261,31 +357,225 @@ def populate_tablewidget_with_df(table_widget: QTableWidget,
     # Set the headers in the QTableWidget using the column names of the DataFrame
     table_widget.setHorizontalHeaderLabels([str(col) for col in df.columns])
     table_widget.setVerticalHeaderLabels([str(idx) for idx in df.index])
-    table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
-    # Populate the QTableWidget with the data
-    for row in range(len(df.index)):
+    # Suspend sorting, repaints and model signals while the cells are set
+    sorting_enabled = table_widget.isSortingEnabled()
+    table_widget.setSortingEnabled(False)
+    table_widget.setUpdatesEnabled(False)
+    table_widget.model().blockSignals(True)
+
+    try:
+        # Populate the QTableWidget with the data, formatted column by column
         for col in range(len(df.columns)):
-            # Use iat for better performance in accessing scalar values
-            item_value = df.iat[row, col]
-            if isinstance(item_value, float) and item_value.is_integer():
-                item_value = int(item_value)
-            table_widget.setItem(row, col, QTableWidgetItem(str(item_value)))
+            for row, item_value in enumerate(format_series_as_strings(df.iloc[:, col])):
+                table_widget.setItem(row, col, QTableWidgetItem(item_value))
+    finally:
+        table_widget.model().blockSignals(False)
+        table_widget.setSortingEnabled(sorting_enabled)
+        table_widget.setUpdatesEnabled(True)
+
+    # Stretch the columns once all the cells are known, then repaint
+    table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    table_widget.viewport().update()
+
+def populate_tableview_with_df(table_view: QTableView,
+    df: pd.DataFrame) -> None:
+    """
+    Displays a Pandas DataFrame in a QTableView through a DataFrameModel. 
+
+    Contrary to populate_tablewidget_with_df, no item is created per cell : 
+    the view only formats the cells it displays, which keeps large query 
+    results fast to show and light in memory.
+
+    Args:
+        table_view (QTableView): The QTableView instance to display the data in.
+        df (pd.DataFrame): The DataFrame containing the data to display, its 
+        column names and index being used as headers.
+
+    """
+    # Release the model of the previous DataFrame, which is parented to the view
+    previous_model = table_view.model()
+    table_view.setModel(DataFrameModel(df, table_view))
+    if isinstance(previous_model, DataFrameModel) and previous_model.parent() is table_view:
+        previous_model.deleteLater()
+
+    table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
 def clear_layout(layout) -> None:
     """
     Removes all widgets from a given layout and deletes them.
 
+    Nested layouts are emptied too, using an explicit stack rather than 
+    recursion.
+
     Args:
         layout (QLayout): The layout from which to remove all widgets.
     """
-    while layout.count():
-        item = layout.takeAt(0)
-        widget = item.widget()
-        if widget is not None:
-            widget.deleteLater()
-        elif item.layout() is not None:
-            clear_layout(item.layout())
+    layouts = [layout]
+    while layouts:
+        current = layouts.pop()
+        while current.count():
+            item = current.takeAt(0)
+            widget = item.widget()
+            if widget is not None:
+                widget.deleteLater()
+            elif item.layout() is not None:
+                layouts.append(item.layout())
+
+def get_layout_webview(layout) -> QWebEngineView | None:
+    """
+    Returns the web view of a layout that contains nothing else.
+
+    Args:
+        layout (QLayout): The layout to be inspected.
+
+    Returns:
+        QWebEngineView | None: The only widget of the layout if it is a web 
+        view, `None` otherwise.
+
+    """
+    if layout.count() != 1:
+        return None
+
+    widget = layout.itemAt(0).widget()
+
+    return widget if isinstance(widget, QWebEngineView) else None
+
+@functools.lru_cache(maxsize=None)
+def get_plotlyjs_directory() -> str:
+    """
+    Returns a local directory containing the plotly.js bundle.
+
+    The bundle shipped with the installed plotly package is written once per 
+    process, so that the charts no longer download it from the CDN each time 
+    they are displayed. It goes to a new private directory (readable by the 
+    current user only, with an unpredictable name) rather than to a shared 
+    path: as the pages are loaded with a file base URL, a script planted there 
+    by another user would run in every chart. The directory is removed when 
+    the application exits.
+
+    Returns:
+        str: The path of the directory containing 'plotly.min.js'.
+
+    """
+    directory = tempfile.mkdtemp(prefix='plotlyjs-')
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+
+    with open(os.path.join(directory, 'plotly.min.js'), 'w', encoding='utf-8') as script_file:
+        script_file.write(get_plotlyjs())
+
+    return directory
+
+def display_plotly_html(vertical_layout: QVBoxLayout, plot_html: str) -> None:
+    """
+    Displays the HTML of a Plotly figure in a QWebEngineView of the given layout.
+
+    The web view left in the layout by a previous call is reused, so that 
+    redrawing a chart only loads new HTML instead of creating a new web view 
+    (and its Chromium renderer). Otherwise, the layout is cleared and a new web 
+    view is added to it.
+
+    Args:
+        vertical_layout (QVBoxLayout): The layout where the figure will be displayed.
+        plot_html (str): The HTML generated by `convert_figure_to_html`.
+
+    """
+    # The page loads plotly.js from the local directory given as its base URL
+    base_url = QUrl.fromLocalFile(os.path.join(get_plotlyjs_directory(), ''))
+
+    webview = get_layout_webview(vertical_layout)
+    if webview is None:
+        # First clear the layout
+        clear_layout(vertical_layout)
+
+        # Create a QWebEngineView and add it to the QVBoxLayout
+        webview = QWebEngineView()
+        vertical_layout.addWidget(webview)
+
+    webview.setHtml(plot_html, base_url)
+
+def convert_figure_to_html(fig: go.Figure) -> str:
+    """
+    Generates the HTML representation of a Plotly figure, which loads 
+    plotly.js from the directory returned by `get_plotlyjs_directory`.
+
+    The figure is not validated again on conversion, since its traces and 
+    layout were already validated when the graph objects were built.
+
+    Args:
+        fig (go.Figure): The Plotly figure to be converted.
+
+    Returns:
+        str: The HTML div of the figure.
+
+    """
+    return plot(fig, output_type='div', include_plotlyjs='directory', validate=False)
+
+def get_dataframe_key(df: pd.DataFrame) -> tuple:
+    """
+    Returns a hashable key identifying the content of a DataFrame.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to be identified.
+
+    Returns:
+        tuple: The column names and the sum of the row hashes (index included).
+
+    """
+    return tuple(df.columns), int(pd.util.hash_pandas_object(df).sum())
+
+def get_cached_plotly_html(cache_key: tuple, build_figure) -> str:
+    """
+    Returns the HTML of a Plotly chart, building the figure only when it is not 
+    already in `PLOTLY_HTML_CACHE`.
+
+    The cache keeps the `PLOTLY_HTML_CACHE_SIZE` most recently requested 
+    charts, so that switching back to a previous chart or setting does not 
+    build and serialize its figure again.
+
+    Args:
+        cache_key (tuple): A key identifying the chart type, its data and its 
+        settings.
+        build_figure (callable): A function without arguments returning the 
+        go.Figure of the chart, called on a cache miss.
+
+    Returns:
+        str: The HTML generated by `convert_figure_to_html`.
+
+    """
+    plot_html = PLOTLY_HTML_CACHE.pop(cache_key, None)
+    if plot_html is None:
+        plot_html = convert_figure_to_html(build_figure())
+        if len(PLOTLY_HTML_CACHE) >= PLOTLY_HTML_CACHE_SIZE:
+            # Evict the least recently displayed chart
+            PLOTLY_HTML_CACHE.pop(next(iter(PLOTLY_HTML_CACHE)))
+    PLOTLY_HTML_CACHE[cache_key] = plot_html
+
+    return plot_html
+
+@functools.lru_cache(maxsize=32)
+def compute_macd_values(close: bytes, short_span: int, long_span: int,
+    signal_span: int) -> (np.ndarray, np.ndarray):
+    """
+    Computes the MACD and Signal line values from the raw bytes of a float64 
+    close price array.
+
+    The results are memoized on the price bytes and spans, so that redrawing 
+    the same chart with other settings does not run the EWM passes again.
+
+    """
+    close_series = pd.Series(np.frombuffer(close, dtype=np.float64))
+    exp1 = close_series.ewm(span=short_span, adjust=False).mean()
+    exp2 = close_series.ewm(span=long_span, adjust=False).mean()
+    macd = exp1 - exp2
+    signal = macd.ewm(span=signal_span, adjust=False).mean()
+
+    # Cached arrays are shared between calls, so they are made read-only
+    values = (macd.to_numpy(), signal.to_numpy())
+    for array in values:
+        array.setflags(write=False)
+
+    return values
 
 def calculate_macd(df: pd.DataFrame, short_span: int=12, long_span: int=26,
     signal_span: int=9) -> (pd.Series, pd.Series):
@@ -293,12 +583,33 @@ def calculate_macd(df: pd.DataFrame, short_span: int=12, long_span: int=26,
     Calculate the MACD and Signal line indicators
     
     """
-    exp1 = df['close'].ewm(span=short_span, adjust=False).mean()
-    exp2 = df['close'].ewm(span=long_span, adjust=False).mean()
-    macd = exp1 - exp2
-    signal = macd.ewm(span=signal_span, adjust=False).mean()
+    close = df['close'].to_numpy(dtype=np.float64).tobytes()
+    macd, signal = compute_macd_values(close, short_span, long_span, signal_span)
+
+    return pd.Series(macd, index=df.index), pd.Series(signal, index=df.index)
+
+@functools.lru_cache(maxsize=32)
+def compute_bollinger_values(close: bytes, window_size: int,
+    num_std: float) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+    """
+    Computes the rolling mean, rolling standard deviation, upper and lower 
+    Bollinger Bands from the raw bytes of a float64 close price array.
+
+    The results are memoized on the price bytes and parameters, as for 
+    `compute_macd_values`.
 
-    return macd, signal
+    """
+    rolling = pd.Series(np.frombuffer(close, dtype=np.float64)).rolling(window=window_size)
+    rolling_mean = rolling.mean().to_numpy()
+    rolling_std = rolling.std().to_numpy()
+
+    # Cached arrays are shared between calls, so they are made read-only
+    values = (rolling_mean, rolling_std,
+              rolling_mean + rolling_std * num_std, rolling_mean - rolling_std * num_std)
+    for array in values:
+        array.setflags(write=False)
+
+    return values
 
 def calculate_bollinger_bands(df: pd.DataFrame, window_size: int=20,
     num_std: float=2.0) -> pd.DataFrame:
@@ -306,10 +617,9 @@ def calculate_bollinger_bands(df: pd.DataFrame, window_size: int=20,
     Calculate Bollinger Bands for the given DataFrame.
     
     """
-    df['rolling_mean'] = df['close'].rolling(window=window_size).mean()
-    df['rolling_std'] = df['close'].rolling(window=window_size).std()
-    df['upper_band'] = df['rolling_mean'] + (df['rolling_std'] * num_std)
-    df['lower_band'] = df['rolling_mean'] - (df['rolling_std'] * num_std)
+    close = df['close'].to_numpy(dtype=np.float64).tobytes()
+    (df['rolling_mean'], df['rolling_std'],
+     df['upper_band'], df['lower_band']) = compute_bollinger_values(close, window_size, num_std)
 
     return df
 
@@ -319,8 +629,11 @@ def add_bollinger_bands_to_chart(fig: go.Figure, df: pd.DataFrame,
     Add Bollinger Bands to the Plotly figure.
     
     """
+    # Plotly validates plain NumPy arrays much faster than pandas objects
+    dates = df.index.to_numpy()
+
     # Add the Upper Bollinger Band to the chart
-    fig.add_trace(go.Scatter(x=df.index, y=df['upper_band'],
+    fig.add_trace(go.Scatter(x=dates, y=df['upper_band'].to_numpy(),
                              line=dict(width=1),
                              name='Upper Band',
                              line_color='rgba(68, 68, 68, 0.75)',
@@ -328,7 +641,7 @@ def add_bollinger_bands_to_chart(fig: go.Figure, df: pd.DataFrame,
                   row=row, col=col)
 
     # Add the Lower Bollinger Band to the chart
-    fig.add_trace(go.Scatter(x=df.index, y=df['lower_band'],
+    fig.add_trace(go.Scatter(x=dates, y=df['lower_band'].to_numpy(),
                              line=dict(width=1),
                              name='Lower Band',
                              fill='tonexty',
@@ -348,81 +661,122 @@ def add_moving_average_to_chart(fig: go.Figure, df: pd.DataFrame, sma: str,
     else:
         color = 'white'
 
-    fig.add_trace(go.Scatter(x=df.index, y=df[sma],
+    fig.add_trace(go.Scatter(x=df.index.to_numpy(), y=df[sma].to_numpy(),
                              mode='lines',
                              line=dict(color=color, width=2),
                              showlegend=False),
                   row=row, col=col)
 
-def draw_a_plotly_candlestick_chart(vertical_layout: QVBoxLayout,
-    df: pd.DataFrame, setting: dict):
+def downsample_ohlc(df: pd.DataFrame, rows_per_candle: int) -> pd.DataFrame:
     """
-    Draws a candlestick chart in a PyQt application using Plotly and displays 
-    it within a QWebEngineView.
+    Aggregates an OHLC DataFrame into candles of `rows_per_candle` consecutive 
+    rows.
 
-    This function generates a candlestick chart, along with additional 
-    technical indicators, for financial data provided in a DataFrame. The chart 
-    is then rendered to HTML and displayed using a QWebEngineView that is added 
-    to the given QVBoxLayout.
+    Each candle keeps the first open, the highest high, the lowest low, the 
+    last close and the total volume of its rows, and is labelled with the date 
+    of its last row. Any other column, such as a technical indicator already 
+    calculated on every row, keeps its value at that last row. Grouping 
+    consecutive rows rather than calendar periods keeps the market holidays 
+    and weekends out of the candles.
+
+    Args:
+        df (pd.DataFrame): The stock data, indexed by date, with at least the 
+        columns ['open', 'high', 'low', 'close', 'volume'].
+        rows_per_candle (int): The number of rows aggregated into each candle.
+
+    Returns:
+        pd.DataFrame: The aggregated data, or `df` itself when each candle 
+        would hold a single row.
+
+    """
+    if rows_per_candle <= 1:
+        return df
+
+    # Position of the last row of each candle, the final candle being partial
+    last_rows = np.arange(rows_per_candle - 1, len(df) + rows_per_candle - 1,
+                          rows_per_candle)
+    last_rows[-1] = len(df) - 1
+
+    sampled = df.groupby(np.arange(len(df)) // rows_per_candle).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    sampled.index = df.index[last_rows]
+
+    # Other columns take their value at the last row of each candle
+    other_columns = df.columns.difference(sampled.columns, sort=False)
+    for column in other_columns:
+        sampled[column] = df[column].to_numpy()[last_rows]
+
+    return sampled
+
+def build_candlestick_chart(df: pd.DataFrame, setting: dict) -> go.Figure:
+    """
+    Builds the Plotly figure of a candlestick chart, with its volume, MACD and 
+    optional technical indicators.
 
     Args:
-        vertical_layout (QVBoxLayout): The layout where the chart will be displayed.
         df (pd.DataFrame): The data frame containing the stock data with at 
         least the following columns: ['open', 'high', 'low', 'close', 'volume'].
-        setting (dict): Configuration settings for the chart, which may include:
-            - 'log_scale' (bool): If True, apply logarithmic scale to the y-axis.
-            - 'bollinger' (bool): If True, add Bollinger Bands to the chart.
-            - 'window_size' (int): Window size for calculating Bollinger Bands.
-            - 'num_std' (int): Number of standard deviations for Bollinger width.
-            - 'sma' (bool): If True, add Simple Moving Averages to the chart.
-            - 'sma_1' (int): Window size for the first SMA.
-            - 'sma_2' (int): Window size for the second SMA (only applied if greater than 0).
-            - 'interval' (str): Data interval, affects x-axis formatting.
+        setting (dict): Configuration settings for the chart, as described in 
+        `draw_a_plotly_candlestick_chart`.
 
-    Raises:
-        ValueError: If 'df' is missing any of the required columns.
+    Returns:
+        go.Figure: The candlestick chart figure.
 
     """
-    # First clear the layout
-    clear_layout(vertical_layout)
+    # Calculate MACD and Signal Line on every row, in a copy of the data
+    macd, signal = calculate_macd(df)
+    df = df.assign(macd=macd, signal=signal)
 
-    # Check if all required columns are present in the DataFrame
-    required_columns = ['open', 'high', 'low', 'close', 'volume']
-    if not all(column in df.columns for column in required_columns):
-        raise ValueError(f"DataFrame missing one of the required columns: {required_columns}")
+    # Technical indicator : Bollinger bands
+    if setting['bollinger']:
+        df = calculate_bollinger_bands(
+            df, window_size=setting['window_size'], num_std=setting['num_std'])
 
-    # Calculate MACD and Signal Line
-    macd, signal = calculate_macd(df)
+    # Technical indicator : simple moving average
+    if setting['sma']:
+        df['SMA_1'] = df['close'].rolling(window=setting['sma_1']).mean()
+        if setting['sma_2'] > 0:
+            df['SMA_2'] = df['close'].rolling(window=setting['sma_2']).mean()
+
+    # Limit the number of candles to what the chart can actually display, once
+    # the indicators have been calculated with their windows counted in rows
+    rows_per_candle = 1
+    if not setting.get('full_resolution', False):
+        rows_per_candle = -(-len(df) // MAX_CANDLES)  # Ceiling division
+        df = downsample_ohlc(df, rows_per_candle)
 
     # Create a subplot figure with 2 rows
     fig = make_subplots(rows=3, cols=1, shared_xaxes=True,
                         vertical_spacing=0.03,
                         row_heights=[0.6, 0.15, 0.25])
 
+    # Plotly validates plain NumPy arrays much faster than pandas objects
+    dates = df.index.to_numpy()
+
     # Add the Candlestick chart
-    fig.add_trace(go.Candlestick(x=df.index,
-                                 open=df['open'],
-                                 high=df['high'],
-                                 low=df['low'],
-                                 close=df['close'],
+    fig.add_trace(go.Candlestick(x=dates,
+                                 open=df['open'].to_numpy(),
+                                 high=df['high'].to_numpy(),
+                                 low=df['low'].to_numpy(),
+                                 close=df['close'].to_numpy(),
                                  increasing=dict(line=dict(color='white', width=1)),
                                  decreasing=dict(line=dict(color='black', width=1)),
                                  showlegend=False),
                   row=1, col=1)
 
     # Add Volume Bar Chart
-    fig.add_trace(go.Bar(x=df.index,
-                         y=df['volume'],
+    fig.add_trace(go.Bar(x=dates,
+                         y=df['volume'].to_numpy(),
                          marker_color='lightgrey',
                          showlegend=False),
                   row=2, col=1)
 
     # Add MACD and Signal Line
-    fig.add_trace(go.Scatter(x=df.index, y=macd, mode='lines',
+    fig.add_trace(go.Scatter(x=dates, y=df['macd'].to_numpy(), mode='lines',
                             name='MACD', line=dict(color='black'),
                             showlegend=False),
                   row=3, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=signal, mode='lines',
+    fig.add_trace(go.Scatter(x=dates, y=df['signal'].to_numpy(), mode='lines',
                             name='Signal Line', line=dict(color='white'), showlegend=False),
                   row=3, col=1)
 
@@ -432,22 +786,14 @@ def draw_a_plotly_candlestick_chart(vertical_layout: QVBoxLayout,
 
     # Technical indicator : Bollinger bands
     if setting['bollinger']:
-        # Calculate Bollinger bands
-        df = calculate_bollinger_bands(
-            df, window_size=setting['window_size'], num_std=setting['num_std'])
-
         # Add Bollinger Bands
         add_bollinger_bands_to_chart(fig, df, 1, 1)
 
     # Technical indicator : simple moving average
     if setting['sma']:
-        # Calculate SMA
-        df['SMA_1'] = df['close'].rolling(window=setting['sma_1']).mean()
         # Add SMA 1
         add_moving_average_to_chart(fig, df, 'SMA_1', 1, 1)
         if setting['sma_2'] > 0:
-            df['SMA_2'] = df['close'].rolling(
-                window=setting['sma_2']).mean()
             # Add SMA 2
             add_moving_average_to_chart(fig, df, 'SMA_2', 1, 1)
 
@@ -465,19 +811,68 @@ def draw_a_plotly_candlestick_chart(vertical_layout: QVBoxLayout,
         yaxis3=dict(showgrid=True, gridwidth=1, gridcolor='lightgrey')
     )
 
+    # Tell the user when each candle aggregates several periods
+    if rows_per_candle > 1:
+        period = {'daily': 'trading days', 'weekly': 'weeks',
+                  'monthly': 'months'}.get(setting['interval'], 'periods')
+        fig.update_layout(
+            title=dict(text=f"Each candle covers {rows_per_candle} {period} "
+                            "(indicators calculated on every period)",
+                       font=dict(size=12)))
+
     # Update x axes
     if setting['interval'] == 'daily':
         fig.update_xaxes(rangebreaks=[dict(bounds=["sat", "mon"])])
 
-    # Generate HTML representation of the Plotly figure
-    plot_html = plot(fig, output_type='div', include_plotlyjs='cdn')
+    return fig
+
+def draw_a_plotly_candlestick_chart(vertical_layout: QVBoxLayout,
+    df: pd.DataFrame, setting: dict):
+    """
+    Draws a candlestick chart in a PyQt application using Plotly and displays 
+    it within a QWebEngineView.
+
+    This function generates a candlestick chart, along with additional 
+    technical indicators, for financial data provided in a DataFrame. The chart 
+    is then rendered to HTML and displayed using a QWebEngineView that is added 
+    to the given QVBoxLayout.
+
+    The HTML of the most recent charts is kept in `PLOTLY_HTML_CACHE`, keyed 
+    on the content of 'df' and on the settings, so that switching an option 
+    back to a previous value does not build the figure again.
+
+    Args:
+        vertical_layout (QVBoxLayout): The layout where the chart will be displayed.
+        df (pd.DataFrame): The data frame containing the stock data with at 
+        least the following columns: ['open', 'high', 'low', 'close', 'volume'].
+        setting (dict): Configuration settings for the chart, which may include:
+            - 'log_scale' (bool): If True, apply logarithmic scale to the y-axis.
+            - 'bollinger' (bool): If True, add Bollinger Bands to the chart.
+            - 'window_size' (int): Window size for calculating Bollinger Bands.
+            - 'num_std' (int): Number of standard deviations for Bollinger width.
+            - 'sma' (bool): If True, add Simple Moving Averages to the chart.
+            - 'sma_1' (int): Window size for the first SMA.
+            - 'sma_2' (int): Window size for the second SMA (only applied if greater than 0).
+            - 'interval' (str): Data interval, affects x-axis formatting.
+            - 'full_resolution' (bool, optional): If True, draw every row of 
+            'df'. Otherwise, once the indicators have been calculated on every 
+            row, long series are aggregated to at most `MAX_CANDLES` candles, 
+            and the chart title states how many periods each candle covers.
 
-    # Create a QWebEngineView to display the HTML
-    webview = QWebEngineView()
-    webview.setHtml(plot_html)
+    Raises:
+        ValueError: If 'df' is missing any of the required columns.
 
-    # Add the QWebEngineView to the QVBoxLayout
-    vertical_layout.addWidget(webview)
+    """
+    # Check if all required columns are present in the DataFrame
+    check_columns_exist(df, ['open', 'high', 'low', 'close', 'volume'])
+
+    # Reuse the HTML of a chart already built from the same data and settings
+    cache_key = ('candlestick', get_dataframe_key(df), tuple(sorted(setting.items())))
+    plot_html = get_cached_plotly_html(
+        cache_key, lambda: build_candlestick_chart(df, setting))
+
+    # Display the chart, reusing the web view already in the layout if any
+    display_plotly_html(vertical_layout, plot_html)
 
 def plot_vertical_barchart(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     x_var: str, y_var: str, title: str) -> None:
@@ -506,8 +901,7 @@ def plot_vertical_barchart(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
 
     """
     # Ensure the specified columns exist in the DataFrame
-    if x_var not in df.columns or y_var not in df.columns:
-        raise ValueError(f"The DataFrame must contain the columns '{x_var}' and '{y_var}'.")
+    check_columns_exist(df, [x_var, y_var])
 
     # Clear the existing figure to prepare for a new plot
     canvas.figure.clf()
@@ -516,41 +910,28 @@ def plot_vertical_barchart(canvas: FigureCanvasQTAgg, df: pd.DataFrame,
     # Create the vertical bar chart directly on the provided axes
     bars = ax.bar(df[x_var], df[y_var], color='grey')
 
-    # Annotate each bar with its value
-    for bar_ in bars:
-        height = bar_.get_height()
-        ax.text(bar_.get_x() + bar_.get_width() / 2, height, f'{height:.1f}',
-                va='bottom', ha='center', fontsize=6
-            )  # Vertically align bottom which is actually above the bar
+    # Annotate each bar with its value, just above the bar
+    ax.bar_label(bars, fmt='%.1f', fontsize=6)
 
     ax.set_xlabel(x_var)
     ax.set_ylabel(y_var)
     ax.set_title(title)
 
     canvas.figure.tight_layout()  # Adjust layout to prevent overlap
-    canvas.draw()  # Refresh the canvas with the new plot
+    canvas.draw_idle()  # Schedule a refresh of the canvas with the new plot
 
-def draw_a_plotly_scatter_plot(vertical_layout: QVBoxLayout,
-    df: pd.DataFrame) -> None:
+def build_scatter_plot(df: pd.DataFrame) -> go.Figure:
     """
-    Creates and displays a scatter plot using Plotly in a specified 
-    QVBoxLayout. The function clears any existing widgets in the layout, 
-    creates a scatter plot from the provided DataFrame, and embeds it within 
-    the layout as a QWebEngineView.
+    Builds the Plotly figure of a scatter plot, as described in 
+    `draw_a_plotly_scatter_plot`.
 
     Args:
-        vertical_layout (QVBoxLayout): The layout where the plot will be 
-        displayed. It is cleared at the beginning to ensure that only the 
-        current plot is displayed.
-        df (pd.DataFrame): The DataFrame containing the data to plot. This 
-        DataFrame should have at least four columns, where the second column is 
-        used for the x-axis, the third for the y-axis, the fourth for the size 
-        of the scatter plot points, and the first column for color coding and labeling.
+        df (pd.DataFrame): The DataFrame containing the data to plot.
 
-    """
-    # First clear the layout
-    clear_layout(vertical_layout)
+    Returns:
+        go.Figure: The scatter plot figure.
 
+    """
     # Create a plot figure
     fig = px.scatter(df,
                      x=df.columns[1],
@@ -571,12 +952,30 @@ def draw_a_plotly_scatter_plot(vertical_layout: QVBoxLayout,
         hovermode="closest"
     )
 
-    # Generate HTML representation of the Plotly figure
-    plot_html = plot(fig, output_type='div', include_plotlyjs='cdn')
+    return fig
 
-    # Create a QWebEngineView to display the HTML
-    webview = QWebEngineView()
-    webview.setHtml(plot_html)
+def draw_a_plotly_scatter_plot(vertical_layout: QVBoxLayout,
+    df: pd.DataFrame) -> None:
+    """
+    Creates and displays a scatter plot using Plotly in a specified 
+    QVBoxLayout. The function creates a scatter plot from the provided 
+    DataFrame and embeds it within the layout as a QWebEngineView, reusing the 
+    web view of a previous plot if there is one. As for the candlestick chart, 
+    the HTML of recent plots is cached on the content of the DataFrame.
+
+    Args:
+        vertical_layout (QVBoxLayout): The layout where the plot will be 
+        displayed. Any other widget is removed from it, to ensure that only the 
+        current plot is displayed.
+        df (pd.DataFrame): The DataFrame containing the data to plot. This 
+        DataFrame should have at least four columns, where the second column is 
+        used for the x-axis, the third for the y-axis, the fourth for the size 
+        of the scatter plot points, and the first column for color coding and labeling.
+
+    """
+    # Reuse the HTML of a plot already built from the same data
+    plot_html = get_cached_plotly_html(('scatter', get_dataframe_key(df)),
+                                       lambda: build_scatter_plot(df))
 
-    # Add the QWebEngineView to the QVBoxLayout
-    vertical_layout.addWidget(webview)
+    # Display the plot, reusing the web view already in the layout if any
+    display_plotly_html(vertical_layout, plot_html)
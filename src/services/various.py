@@ -9,8 +9,9 @@ Created on 2024-03-18
 
 """
 
+import pandas as pd
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtWidgets import QComboBox
 
 
@@ -76,3 +77,71 @@ class CheckableComboBox(QComboBox):
             if item.checkState() == Qt.CheckState.Checked:
                 checked_items.append(item.text())
         return checked_items
+
+class DataFrameModel(QAbstractTableModel):
+    """
+    A read-only table model exposing a Pandas DataFrame to a QTableView.
+
+    Unlike a QTableWidget, which holds one QTableWidgetItem per cell, the view 
+    only requests the cells it is about to display : values are formatted on 
+    demand, whatever the size of the DataFrame.
+
+    Attributes:
+        df (pd.DataFrame): The DataFrame displayed by the model.
+        values (np.ndarray): The DataFrame values, extracted once as objects so 
+        that each cell is read without going through Pandas, while keeping the 
+        type it has in the DataFrame (no common dtype upcast).
+        column_labels (list): The column names, used as horizontal headers.
+        row_labels (list): The index values, used as vertical headers.
+    """
+    def __init__(self, df: pd.DataFrame, parent=None):
+        """
+        Initializes the model with the DataFrame to display.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to display. Its column names and 
+            index are used as horizontal and vertical headers.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super(DataFrameModel, self).__init__(parent)
+        self.df = df
+        self.values = df.to_numpy(dtype=object)
+        self.column_labels = df.columns.tolist()
+        self.row_labels = df.index.tolist()
+
+    def rowCount(self, parent=QModelIndex()): # pylint: disable=invalid-name
+        """Returns the number of rows of the DataFrame."""
+        return 0 if parent.isValid() else len(self.row_labels)
+
+    def columnCount(self, parent=QModelIndex()): # pylint: disable=invalid-name
+        """Returns the number of columns of the DataFrame."""
+        return 0 if parent.isValid() else len(self.column_labels)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """
+        Returns the value of a cell as a string, without decimal part when a 
+        float holds an integer.
+
+        Args:
+            index (QModelIndex): The position of the cell.
+            role (Qt.ItemDataRole): The requested role, only DisplayRole is served.
+
+        Returns:
+            str | None: The formatted value, or None for other roles.
+        """
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        value = self.values[index.row(), index.column()]
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole): # pylint: disable=invalid-name
+        """Returns the column names and the index values as header labels."""
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == Qt.Orientation.Horizontal:
+            return str(self.column_labels[section])
+        return str(self.row_labels[section])
@@ -736,7 +736,7 @@ class MainWindow(QMainWindow, window.Ui_MainWindow):
 
         try:
             # Execute the SQL query
-            self.stock_reporting.get_sql_query_result(self.tableWidget_query, query_text)
+            self.stock_reporting.get_sql_query_result(self.tableView_query, query_text)
         except Exception as e:  # pylint: disable=broad-except
             # Display a critical error message about the syntax error
             QMessageBox.critical(self, 'Query Error', f'Syntax error in SQL query: {e}')
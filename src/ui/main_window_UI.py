@@ -74,11 +74,9 @@ class Ui_MainWindow(object):
         self.gridLayout_2.addWidget(self.label_query, 0, 0, 1, 3)
         spacerItem1 = QtWidgets.QSpacerItem(695, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
         self.gridLayout_2.addItem(spacerItem1, 2, 0, 1, 1)
-        self.tableWidget_query = QtWidgets.QTableWidget(parent=self.tab_query)
-        self.tableWidget_query.setObjectName("tableWidget_query")
-        self.tableWidget_query.setColumnCount(0)
-        self.tableWidget_query.setRowCount(0)
-        self.gridLayout_2.addWidget(self.tableWidget_query, 3, 0, 1, 3)
+        self.tableView_query = QtWidgets.QTableView(parent=self.tab_query)
+        self.tableView_query.setObjectName("tableView_query")
+        self.gridLayout_2.addWidget(self.tableView_query, 3, 0, 1, 3)
         self.gridLayout_2.setRowStretch(1, 1)
         self.gridLayout_2.setRowStretch(3, 3)
         self.tabWidget_reporting.addTab(self.tab_query, "")